@@ -1,37 +1,52 @@
-import subprocess
+import asyncio
 import datetime
+import os
+import socket
+import sys
+import json
+import time
+import pathlib
 
-def run_command(command: list, show_error: bool = True) -> str | None:
+async def run_command_async(command: list, show_error: bool = True) -> str | None:
     """
-    Executes a shell command and returns its stdout.
+    Executes a command on the event loop and returns its stdout.
     Handles errors gracefully. Can suppress error messages.
     """
     try:
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            check=True,
-            timeout=10
+        proc = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
         )
-        return result.stdout.strip()
     except FileNotFoundError:
         if show_error:
             print(f"❌ Error: Command not found: '{command[0]}'")
         return None
-    except subprocess.CalledProcessError as e:
+
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=10)
+    except asyncio.TimeoutError:
+        # Don't leave the child running once we've given up on it
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass # It exited on its own in the meantime.
+        await proc.wait()
         if show_error:
-            print(f"❌ Error executing command: '{' '.join(command)}'")
-            # Only show stderr if it contains something
-            if e.stderr:
-                print(f"   Stderr: {e.stderr.strip()}")
+            print(f"❌ Error: Command timed out: '{' '.join(command)}'")
         return None
-    except subprocess.TimeoutExpired:
+
+    if proc.returncode != 0:
         if show_error:
-            print(f"❌ Error: Command timed out: '{' '.join(command)}'")
+            print(f"❌ Error executing command: '{' '.join(command)}'")
+            # Only show stderr if it contains something
+            if stderr:
+                print(f"   Stderr: {stderr.decode(errors='replace').strip()}")
         return None
 
-def get_active_users() -> str | None:
+    return stdout.decode(errors='replace').strip()
+
+async def get_active_users() -> str | None:
     """
     Checks for actively logged-in users.
     """
@@ -41,7 +56,7 @@ def get_active_users() -> str | None:
     command = ['who']
     
     # Use our robust wrapper to run the command
-    output = run_command(command)
+    output = await run_command_async(command)
     
     # If the command failed, output will be None. We return None to the caller.
     if output is None:
@@ -58,7 +73,7 @@ def get_active_users() -> str | None:
         
     return report_section
 
-def get_last_logins() -> str | None:
+async def get_last_logins() -> str | None:
     """
     Retrieves the last 10 login records.
     """
@@ -67,7 +82,7 @@ def get_last_logins() -> str | None:
     # The 'last' command shows login history. '-n 10' limits it to 10 lines.
     command = ['last', '-n', '10']
     
-    output = run_command(command)
+    output = await run_command_async(command)
     
     # The same safety check as before.
     if output is None:
@@ -83,30 +98,119 @@ def get_last_logins() -> str | None:
         
     return report_section
 
-def get_listening_ports() -> str | None:
+# The kernel's socket tables. Each is (path, address family, protocol).
+PROC_NET_TABLES = [
+    ('/proc/net/tcp', socket.AF_INET, 'tcp'),
+    ('/proc/net/tcp6', socket.AF_INET6, 'tcp'),
+    ('/proc/net/udp', socket.AF_INET, 'udp'),
+    ('/proc/net/udp6', socket.AF_INET6, 'udp'),
+]
+
+# Socket states as they appear (in hex) in the 'st' column of /proc/net/*.
+# TCP_LISTEN for TCP, and TCP_CLOSE for unconnected UDP sockets (what 'ss -l' shows).
+LISTEN_STATES = {'tcp': '0A', 'udp': '07'}
+
+def decode_proc_address(hex_address: str, family: int) -> str:
     """
-    Finds all TCP/UDP ports in a listening state and the processes using them.
+    Converts a /proc/net address like '0100007F:0035' into '127.0.0.1:53'.
+    """
+    hex_ip, hex_port = hex_address.split(':')
+    port = int(hex_port, 16)
+    
+    # The kernel prints the address as 32-bit words in host byte order,
+    # so on little-endian hosts each 4-byte group is flipped back to network order.
+    packed = bytes.fromhex(hex_ip)
+    if sys.byteorder == 'little':
+        packed = b''.join(packed[i:i + 4][::-1] for i in range(0, len(packed), 4))
+    ip = socket.inet_ntop(family, packed)
+    
+    if family == socket.AF_INET6:
+        return f"[{ip}]:{port}"
+    return f"{ip}:{port}"
+
+def get_socket_owners(inodes: set) -> dict:
+    """
+    Maps socket inodes to the name of the process holding them open.
+    Processes we are not allowed to inspect are silently skipped.
     """
-    print("ℹ️  Scanning for listening ports (ss -tulpn)...")
+    owners = {}
+    remaining = set(inodes)
     
-    # ss = socket statistics. 
-    # -t = tcp, -u = udp, -l = listening, -p = processes, -n = numeric
-    command = ['ss', '-tulpn']
+    for pid in os.listdir('/proc'):
+        if not remaining:
+            break # Every socket has been accounted for, stop walking /proc.
+        if not pid.isdigit():
+            continue
+        
+        fd_dir = f"/proc/{pid}/fd"
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            continue # Process exited or belongs to another user.
+        
+        for fd in fds:
+            try:
+                target = os.readlink(f"{fd_dir}/{fd}")
+            except OSError:
+                continue
+            
+            # Socket links look like 'socket:[12345]'
+            if not target.startswith('socket:['):
+                continue
+            inode = target[8:-1]
+            if inode not in remaining:
+                continue
+            
+            try:
+                with open(f"/proc/{pid}/comm") as f:
+                    owners[inode] = f.read().strip()
+            except OSError:
+                break # Process exited while we were looking at it.
+            remaining.discard(inode)
     
-    output = run_command(command)
+    return owners
+
+def read_proc_listening_ports() -> list | None:
+    """
+    Reads listening TCP/UDP sockets straight from the kernel's /proc/net tables.
+    Returns None if the tables aren't available (e.g. not running on Linux).
+    """
+    sockets = []
+    found_table = False
     
-    if output is None:
-        return None # The command failed entirely.
+    for path, family, protocol in PROC_NET_TABLES:
+        try:
+            with open(path) as f:
+                next(f, None) # Skip the column header line.
+                rows = f.readlines()
+        except OSError:
+            continue # e.g. tcp6/udp6 are missing when IPv6 is disabled.
+        found_table = True
         
-    header = "--- Listening Ports ---"
+        for row in rows:
+            fields = row.split()
+            # Fields: sl, local_address, rem_address, st, ..., inode (index 9)
+            if len(fields) < 10 or fields[3] != LISTEN_STATES[protocol]:
+                continue
+            sockets.append((decode_proc_address(fields[1], family), fields[9]))
     
+    if not found_table:
+        return None
+    
+    owners = get_socket_owners({inode for _, inode in sockets})
+    
+    return [
+        f"  - Port: {address} | Process: {owners.get(inode, 'N/A')}"
+        for address, inode in sockets
+    ]
+
+def parse_ss_output(output: str) -> list:
+    """
+    Parses the output of 'ss -tulpn' into report lines.
+    """
     # The output of 'ss' has a header line. We need to skip it.
     lines = output.strip().split('\n')
     
-    # If there's only the header or less, no ports are listening.
-    if len(lines) <= 1:
-        return f"{header}\nNo listening ports found.\n"
-        
     parsed_ports = []
     # We start the loop from the second line to skip the header
     for line in lines[1:]:
@@ -122,6 +226,32 @@ def get_listening_ports() -> str | None:
             process_name = process_info.split('"')[1] if '"' in process_info else 'N/A'
             
             parsed_ports.append(f"  - Port: {local_address_port} | Process: {process_name}")
+    
+    return parsed_ports
+
+async def get_listening_ports() -> str | None:
+    """
+    Finds all TCP/UDP ports in a listening state and the processes using them.
+    """
+    print("ℹ️  Scanning for listening ports...")
+    
+    # Reading the kernel's socket tables directly avoids forking 'ss'.
+    # Walking /proc/*/fd is blocking work, so keep it off the event loop.
+    parsed_ports = await asyncio.to_thread(read_proc_listening_ports)
+    
+    if parsed_ports is None:
+        # No /proc/net available, fall back to ss (socket statistics).
+        # -t = tcp, -u = udp, -l = listening, -p = processes, -n = numeric
+        command = ['ss', '-tulpn']
+        
+        output = await run_command_async(command)
+        
+        if output is None:
+            return None # The command failed entirely.
+        
+        parsed_ports = parse_ss_output(output)
+        
+    header = "--- Listening Ports ---"
 
     if not parsed_ports:
         return f"{header}\nNo listening ports found.\n"
@@ -130,12 +260,114 @@ def get_listening_ports() -> str | None:
     report_body = "\n".join(parsed_ports)
     return f"{header}\n{report_body}\n"
 
-def check_cloud_metadata() -> str:
+# Whether a host is a cloud instance practically never changes, so the answer
+# is remembered between runs instead of probing (and waiting) every time.
+CLOUD_CACHE_TTL = 24 * 60 * 60 # seconds
+# Bump this whenever the cache format changes so old entries are ignored.
+CLOUD_CACHE_VERSION = 1
+
+def get_cloud_cache_file() -> pathlib.Path | None:
+    """
+    Returns the cloud cache location, or None if the cache shouldn't be used.
+    """
+    home = pathlib.Path.home()
+    
+    # Under 'sudo' with HOME preserved we'd be running as root inside another
+    # user's home. Don't create root-owned files there or trust theirs.
+    try:
+        if home.stat().st_uid != os.geteuid():
+            return None
+    except OSError:
+        return None
+    
+    return home / '.cache' / 'linux-recon-toolkit' / 'cloud.json'
+
+def load_cloud_cache() -> bool | None:
+    """
+    Returns the cached cloud check result, or None if there is no fresh entry.
+    """
+    cache_file = get_cloud_cache_file()
+    if cache_file is None:
+        return None
+    
+    try:
+        with open(cache_file) as f:
+            # Only trust a cache file we wrote ourselves.
+            if os.fstat(f.fileno()).st_uid != os.geteuid():
+                return None
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None # Missing or corrupt cache, just probe again.
+    
+    if not isinstance(entry, dict) or entry.get('version') != CLOUD_CACHE_VERSION:
+        return None
+    
+    timestamp = entry.get('timestamp')
+    is_cloud = entry.get('is_cloud')
+    if not isinstance(timestamp, (int, float)) or not isinstance(is_cloud, bool):
+        return None
+    if not 0 <= time.time() - timestamp < CLOUD_CACHE_TTL:
+        return None
+    
+    return is_cloud
+
+def save_cloud_cache(is_cloud: bool) -> None:
+    """
+    Stores the cloud check result. Failing to write the cache is not an error.
+    """
+    cache_file = get_cloud_cache_file()
+    if cache_file is None:
+        return
+    
+    entry = {
+        'version': CLOUD_CACHE_VERSION,
+        'is_cloud': is_cloud,
+        'timestamp': time.time()
+    }
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_file, 'w') as f:
+            json.dump(entry, f)
+        # Rename into place so a concurrent run never reads a half-written file
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        try:
+            tmp_file.unlink()
+        except OSError:
+            pass
+
+async def check_cloud_metadata() -> str:
     """
     Checks if the machine has access to a standard cloud metadata service.
     """
     print("ℹ️  Checking for cloud metadata service...")
     
+    header = "--- Cloud Instance Check ---"
+    
+    is_cloud = load_cloud_cache()
+    if is_cloud is None:
+        is_cloud = await probe_cloud_metadata()
+        # Only remember a definitive answer. An error (missing tool, network
+        # not up yet) would otherwise be reported for a whole day.
+        if is_cloud is not None:
+            save_cloud_cache(is_cloud)
+    
+    if is_cloud:
+        # Success means the service is accessible.
+        report_body = "✅ Cloud metadata service is accessible. This machine is likely a cloud instance."
+    else:
+        # Failure (timeout or other error) means the service is not there.
+        report_body = "ℹ️ Cloud metadata service not found. This is likely not a standard cloud instance."
+        
+    return f"{header}\n{report_body}\n"
+
+async def probe_cloud_metadata() -> bool | None:
+    """
+    Probes the cloud metadata service.
+    Returns True if it answered, or None if the result is inconclusive.
+    """
     # 169.254.169.254 is a non-routable IP used by cloud providers (AWS, GCP, Azure)
     # for instance metadata.
     # -s = silent, --connect-timeout 1 = fail after 1 second.
@@ -147,20 +379,24 @@ def check_cloud_metadata() -> str:
         'http://169.254.169.254/latest/meta-data/'
     ]
     
-    output = run_command(command, show_error=False)
-
-    
-    header = "--- Cloud Instance Check ---"
+    output = await run_command_async(command, show_error=False)
     
-    # the run_command returns None on failure (timeout, error, etc.)
-    if output is not None and output != "":
-        # Success means the service is accessible.
-        report_body = "✅ Cloud metadata service is accessible. This machine is likely a cloud instance."
-    else:
-        # Failure (timeout or other error) means the service is not there.
-        report_body = "ℹ️ Cloud metadata service not found. This is likely not a standard cloud instance."
-        
-    return f"{header}\n{report_body}\n"
+    # run_command_async returns None on failure (timeout, error, etc.) without
+    # saying which, so a failed curl can't prove this isn't a cloud instance.
+    if output:
+        return True
+    return None
+
+async def gather_report_parts() -> list:
+    """
+    Runs all audit functions concurrently and returns their report sections.
+    """
+    return await asyncio.gather(
+        get_active_users(),
+        get_last_logins(),
+        get_listening_ports(),
+        check_cloud_metadata()
+    )
 
 def main():
     """
@@ -169,13 +405,10 @@ def main():
     print("🚀 Starting System Audit...")
     
     # 1. GATHER DATA
-    # Create a list of all the report sections from our audit functions.
-    report_parts = [
-        get_active_users(),
-        get_last_logins(),
-        get_listening_ports(),
-        check_cloud_metadata()
-    ]
+    # The audit functions are independent and spend their time waiting on
+    # subprocesses, so run them concurrently on one event loop.
+    # gather() returns results in argument order, keeping the report stable.
+    report_parts = asyncio.run(gather_report_parts())
     
     # Filter out any 'None' results from failed functions
     valid_report_parts = [part for part in report_parts if part is not None]
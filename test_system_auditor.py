@@ -0,0 +1,66 @@
+import socket
+
+import system_auditor
+
+
+PROC_NET_TCP = """\
+  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode
+   0: 0100007F:0035 00000000:0000 0A 00000000:00000000 00:00000000 00000000     0        0 1001 1 0000000000000000 100 0 0 10 0
+   1: 00000000:0016 00000000:0000 0A 00000000:00000000 00:00000000 00000000     0        0 1002 1 0000000000000000 100 0 0 10 0
+   2: 0100007F:8082 0100007F:0035 01 00000000:00000000 02:00000491 00000000     0        0 1003 2 0000000000000000 20 4 0 18 -1
+"""
+
+PROC_NET_UDP = """\
+   sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode ref pointer drops
+  100: 00000000:0044 00000000:0000 07 00000000:00000000 00:00000000 00000000     0        0 2001 2 0000000000000000 0
+  101: 0100007F:A000 0100007F:0035 01 00000000:00000000 00:00000000 00000000     0        0 2002 2 0000000000000000 0
+"""
+
+
+def test_decode_proc_address_ipv4(monkeypatch):
+    monkeypatch.setattr(system_auditor.sys, 'byteorder', 'little')
+    assert system_auditor.decode_proc_address('0100007F:0035', socket.AF_INET) == '127.0.0.1:53'
+    assert system_auditor.decode_proc_address('00000000:0016', socket.AF_INET) == '0.0.0.0:22'
+
+
+def test_decode_proc_address_ipv6(monkeypatch):
+    monkeypatch.setattr(system_auditor.sys, 'byteorder', 'little')
+    assert system_auditor.decode_proc_address(
+        '00000000000000000000000001000000:0016', socket.AF_INET6
+    ) == '[::1]:22'
+    assert system_auditor.decode_proc_address(
+        '0000000000000000FFFF00000100007F:0035', socket.AF_INET6
+    ) == '[::ffff:127.0.0.1]:53'
+
+
+def test_decode_proc_address_big_endian(monkeypatch):
+    # Big-endian kernels already print the words in network order.
+    monkeypatch.setattr(system_auditor.sys, 'byteorder', 'big')
+    assert system_auditor.decode_proc_address('7F000001:0035', socket.AF_INET) == '127.0.0.1:53'
+
+
+def test_read_proc_listening_ports_filters_states(tmp_path, monkeypatch):
+    monkeypatch.setattr(system_auditor.sys, 'byteorder', 'little')
+    tcp = tmp_path / 'tcp'
+    tcp.write_text(PROC_NET_TCP)
+    udp = tmp_path / 'udp'
+    udp.write_text(PROC_NET_UDP)
+    monkeypatch.setattr(system_auditor, 'PROC_NET_TABLES', [
+        (str(tcp), socket.AF_INET, 'tcp'),
+        (str(tmp_path / 'tcp6'), socket.AF_INET6, 'tcp'), # missing, skipped
+        (str(udp), socket.AF_INET, 'udp'),
+    ])
+    monkeypatch.setattr(system_auditor, 'get_socket_owners', lambda inodes: {'1002': 'sshd'})
+
+    assert system_auditor.read_proc_listening_ports() == [
+        "  - Port: 127.0.0.1:53 | Process: N/A",
+        "  - Port: 0.0.0.0:22 | Process: sshd",
+        "  - Port: 0.0.0.0:68 | Process: N/A",
+    ]
+
+
+def test_read_proc_listening_ports_without_proc(tmp_path, monkeypatch):
+    monkeypatch.setattr(system_auditor, 'PROC_NET_TABLES', [
+        (str(tmp_path / 'tcp'), socket.AF_INET, 'tcp'),
+    ])
+    assert system_auditor.read_proc_listening_ports() is None